@@ -2,8 +2,8 @@ from timetable_generator import TimetableGenerator, Course, TimeSlot, Room
 from datetime import datetime, timedelta
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
+from collections import defaultdict
+from functools import lru_cache
 
 def create_time_slots():
     """Create time slots for a week."""
@@ -61,54 +61,95 @@ def create_rooms():
     
     return rooms
 
-def load_courses_from_excel():
+# Columns of the offered courses sheet that load_courses_from_excel uses
+OFFERED_COURSE_COLUMNS = ['Offered By', 'Code', 'Course Title', 'Course Instructor', 'Offered For', 'CH']
+
+@lru_cache(maxsize=None)
+def _read_offered_courses(excel_path, mtime):
+    """
+    Read the offered courses sheet. A Parquet copy is kept next to the workbook and
+    reused while it is newer than the workbook's mtime; mtime is part of the cache key.
+    """
+    parquet_path = os.path.splitext(excel_path)[0] + '.parquet'
+    df = None
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= mtime:
+        try:
+            df = pd.read_parquet(parquet_path, columns=OFFERED_COURSE_COLUMNS)
+        except (ImportError, ValueError, OSError):
+            pass  # No Parquet engine installed or unreadable copy, fall back to Excel
+    if df is None:
+        # Read only the used columns, all as pandas string dtype; this also keeps CH,
+        # which mixes numbers and strings like '2+1', storable as Parquet
+        with pd.ExcelFile(excel_path, engine='openpyxl') as workbook:
+            df = workbook.parse(
+                usecols=OFFERED_COURSE_COLUMNS,
+                dtype={column: 'string' for column in OFFERED_COURSE_COLUMNS}
+            )[OFFERED_COURSE_COLUMNS]
+        try:
+            df.to_parquet(parquet_path)
+        except (ImportError, ValueError, TypeError, OSError) as e:
+            print(f"Could not cache {excel_path} as Parquet: {e}")
+    # Missing cells used to come out of str() as 'nan'; string dtype would give '<NA>'
+    return df.fillna('nan')
+
+def read_offered_courses(excel_path, mtime):
+    """Read the offered courses sheet through the cache, as a copy the caller may modify."""
+    return _read_offered_courses(excel_path, mtime).copy()
+
+def load_courses_from_excel(excel_path=r'D:\codes\GIKI Timetable\List of Offered Courses.xlsx'):
     """Load courses from the Excel file using the correct column names, and skip HM, HUM, Humanities, SMgs courses, and labs (courses ending with 'L')."""
-    excel_path = r'D:\codes\GIKI Timetable\List of Offered Courses.xlsx'
     try:
-        df = pd.read_excel(excel_path)
+        df = read_offered_courses(excel_path, os.path.getmtime(excel_path))
         print("\nFirst few rows of Excel file:")
         print(df.head())
         print("\nColumns in Excel file:")
         print(df.columns)
         
-        courses = []
         print("\nProcessing courses...")
-        for _, row in df.iterrows():
-            department = str(row['Offered By']).strip().upper()
-            course_code = str(row['Code']).strip().upper()
-            
-            # Skip labs (courses ending with 'L')
-            if course_code.endswith('L'):
-                print(f"SKIPPING LAB: {course_code} ({row['Course Title']})")
-                continue
-            
-            # Map DMTE and DCHE to FMCE
-            if department in ['DMTE', 'DCHE']:
-                department = 'FMCE'
-            # Skip HM, HUM, Humanities, and SMgs courses
-            if department in ['HM', 'HUM', 'HUMANITIES', 'SMGS']:
-                print(f"SKIPPING: {row['Code']} ({row['Course Title']}) offered by {row['Offered By']} (department: {department})")
-                continue
-                
-            ch_str = str(row['CH'])
-            if pd.isnull(row['CH']) or ch_str.lower() == 'nan':
-                ch_main = 1
-            elif '+' in ch_str:
-                ch_main = sum(int(x) for x in ch_str.split('+') if x.isdigit())
+        department = df['Offered By'].str.strip().str.upper()
+        course_code = df['Code'].str.strip().str.upper()
+        
+        # Map DMTE and DCHE to FMCE
+        department = department.replace({'DMTE': 'FMCE', 'DCHE': 'FMCE'})
+        # Skip labs (courses ending with 'L') and HM, HUM, Humanities, and SMgs courses
+        is_lab = course_code.str.endswith('L')
+        is_skipped_dept = ~is_lab & department.isin(['HM', 'HUM', 'HUMANITIES', 'SMGS'])
+        for idx in df.index[is_lab | is_skipped_dept]:
+            row = df.loc[idx]
+            if is_lab[idx]:
+                print(f"SKIPPING LAB: {course_code[idx]} ({row['Course Title']})")
             else:
-                ch_main = int(ch_str)
-            duration = 60  # Each session is 1 hour
-            # Create a separate session for each credit hour
-            for session_num in range(1, ch_main + 1):
-                course = Course(
-                    id=f"{row['Code']}-{session_num}",
-                    name=f"{row['Course Title']} (Session {session_num})",
-                    teacher=str(row['Course Instructor']),
-                    student_group=str(row['Offered For']),
-                    duration=duration,
-                    department=department
-                )
-                courses.append(course)
+                print(f"SKIPPING: {row['Code']} ({row['Course Title']}) offered by {row['Offered By']} (department: {department[idx]})")
+        kept = df[~(is_lab | is_skipped_dept)]
+        
+        # Sum credit hours like '2+1'; a missing CH counts as one session
+        ch_main = (kept['CH']
+                   .str.extractall(r'(\d+)(?:\.\d+)?')[0].astype(int)
+                   .groupby(level=0).sum()
+                   .reindex(kept.index, fill_value=1))
+        duration = 60  # Each session is 1 hour
+        # Create a separate session for each credit hour
+        sessions = kept.loc[kept.index.repeat(ch_main)]
+        session_nums = sessions.groupby(level=0).cumcount() + 1
+        courses = [
+            Course(
+                id=f"{code}-{session_num}",
+                name=f"{title} (Session {session_num})",
+                teacher=teacher,
+                student_group=group,
+                duration=duration,
+                department=dept,
+                course_code=code
+            )
+            for code, title, teacher, group, dept, session_num in zip(
+                sessions['Code'],
+                sessions['Course Title'],
+                sessions['Course Instructor'],
+                sessions['Offered For'],
+                department[sessions.index],
+                session_nums
+            )
+        ]
         
         # Print summary of courses by department
         print("\nCourses by Department:")
@@ -130,6 +171,10 @@ def load_courses_from_excel():
         return []
 
 def plot_room_timetable(generator):
+    # Plotting libraries are slow to import, so only load them when plotting
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Build a DataFrame for plotting
     data = []
     for course in generator.courses:
@@ -139,7 +184,7 @@ def plot_room_timetable(generator):
             data.append({
                 'Room': room,
                 'Day': time_slot.day,
-                'Start': time_slot.start_time.strftime('%H:%M'),
+                'Start': time_slot.start_str,
                 'Course': course.name
             })
     import pandas as pd
@@ -148,32 +193,32 @@ def plot_room_timetable(generator):
     df['Slot'] = df['Day'] + ' ' + df['Start']
     timetable = df.pivot(index='Room', columns='Slot', values='Course')
     plt.figure(figsize=(18, len(timetable) * 0.5 + 4))
-    sns.heatmap(timetable.isnull(), cbar=False, cmap='Blues', linewidths=0.5, linecolor='gray')
-    for y in range(timetable.shape[0]):
-        for x in range(timetable.shape[1]):
-            val = timetable.iloc[y, x]
-            if pd.notnull(val):
-                plt.text(x + 0.5, y + 0.5, val, ha='center', va='center', fontsize=8)
+    ax = sns.heatmap(timetable.isnull(), cbar=False, cmap='Blues', linewidths=0.5, linecolor='gray')
+    # Label only the occupied cells, found in one pass over the grid; every label
+    # is a Text artist, so empty cells must not get one
+    rows, cols = timetable.notnull().to_numpy().nonzero()
+    for y, x, label in zip(rows, cols, timetable.to_numpy()[rows, cols]):
+        ax.text(x + 0.5, y + 0.5, label, ha='center', va='center', fontsize=8)
     plt.title('Room Timetable')
     plt.xlabel('Time Slot')
     plt.ylabel('Room')
     plt.tight_layout()
     plt.show()
 
-def plot_department_timetable(generator, department):
-    """Plot timetable for a specific department."""
+def plot_department_timetable(generator, department, courses_by_dept, rooms_by_dept):
+    """Plot timetable for a specific department, given courses and rooms grouped by department."""
     print(f"\n{'='*50}")
     print(f"Timetable for {department}")
     print(f"{'='*50}")
     
     # Get all courses for this department
-    dept_courses = [c for c in generator.courses if c.department.upper() == department.upper()]
+    dept_courses = courses_by_dept.get(department.upper(), [])
     if not dept_courses:
         print(f"No courses found for department {department}")
         return
     
     # Get all rooms for this department
-    dept_rooms = [r for r in generator.rooms if r.department.upper() == department.upper()]
+    dept_rooms = rooms_by_dept.get(department.upper(), [])
     print(f"\nAvailable rooms for {department}:")
     for room in dept_rooms:
         print(f"- {room.id} (Capacity: {room.capacity})")
@@ -185,13 +230,12 @@ def plot_department_timetable(generator, department):
         if course.id in generator.room_assignments:
             time_slot = generator.time_slots[generator.color_assignments[course.id]]
             room = generator.room_assignments[course.id]
-            course_code = course.id.split('-')[0]
             scheduled_courses.append({
-                'Course': course_code,
+                'Course': course.course_code,
                 'Teacher': course.teacher,
                 'Group': course.student_group,
                 'Day': time_slot.day,
-                'Time': time_slot.start_time.strftime('%H:%M'),
+                'Time': time_slot.start_str,
                 'Room': room
             })
         else:
@@ -209,30 +253,28 @@ def plot_department_timetable(generator, department):
     if unscheduled_courses:
         print(f"\nUnscheduled courses ({len(unscheduled_courses)}):")
         for course in unscheduled_courses:
-            course_code = course.id.split('-')[0]
-            print(f"- {course_code} (Teacher: {course.teacher}, Group: {course.student_group})")
+            print(f"- {course.course_code} (Teacher: {course.teacher}, Group: {course.student_group})")
     
     # Create a more readable timetable format
     if scheduled_courses:
-        df = pd.DataFrame(scheduled_courses)
+        # Build (day, room) -> time -> courses directly instead of pivoting a DataFrame
+        days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        day_index = {day: i for i, day in enumerate(days_order)}
+        cells = defaultdict(dict)
+        for entry in scheduled_courses:
+            row = cells[(entry['Day'], entry['Room'])]
+            time = entry['Time']
+            row[time] = f"{row[time]}, {entry['Course']}" if time in row else entry['Course']
         
-        # Create a pivot table with days as index and times as columns
-        timetable = pd.pivot_table(
-            df,
-            values='Course',
-            index=['Day', 'Room'],
-            columns='Time',
-            aggfunc=lambda x: ', '.join(x)
+        # Sort rows by day, then room, and columns by time
+        keys = sorted(cells, key=lambda key: (day_index[key[0]], key[1]))
+        times = sorted({time for row in cells.values() for time in row})
+        timetable = pd.DataFrame(
+            [cells[key] for key in keys],
+            index=pd.MultiIndex.from_tuples(keys, names=[None, 'Room']),
+            columns=pd.Index(times, name='Time')
         )
         
-        # Sort the index by day
-        days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-        timetable.index = pd.MultiIndex.from_arrays([
-            pd.Categorical(timetable.index.get_level_values(0), categories=days_order),
-            timetable.index.get_level_values(1)
-        ])
-        timetable = timetable.sort_index()
-        
         # Display the timetable
         print("\nDepartment Timetable:")
         print("===================")
@@ -278,6 +320,14 @@ def main():
     for course in courses:
         generator.add_course(course)
     
+    # Group courses and rooms by department once for all department timetables
+    courses_by_dept = defaultdict(list)
+    for course in generator.courses:
+        courses_by_dept[course.department].append(course)
+    rooms_by_dept = defaultdict(list)
+    for room in generator.rooms:
+        rooms_by_dept[room.department].append(room)
+    
     try:
         # Generate the timetable
         timetable = generator.generate_timetable()
@@ -285,7 +335,7 @@ def main():
         # Print and plot timetables for each department
         departments = ['FCSE', 'FEE', 'FME', 'FES', 'FMCE', 'DCve', 'NAB']
         for dept in departments:
-            plot_department_timetable(generator, dept)
+            plot_department_timetable(generator, dept, courses_by_dept, rooms_by_dept)
             
     except KeyError as e:
         # Handle the case where a course doesn't have a room assignment
@@ -324,8 +374,8 @@ def main():
         print("\nContinuing with other departments...")
         departments = ['FCSE', 'FEE', 'FME', 'FES', 'FMCE', 'DCve', 'NAB']
         for dept in departments:
-            if dept != course.department:  # Skip the problematic department
-                plot_department_timetable(generator, dept)
+            if dept.upper() != course.department:  # Skip the problematic department
+                plot_department_timetable(generator, dept, courses_by_dept, rooms_by_dept)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
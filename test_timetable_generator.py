@@ -0,0 +1,161 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pandas as pd
+
+from timetable_generator import TimetableGenerator, Course
+from test_timetable import create_rooms, create_time_slots, load_courses_from_excel, read_offered_courses
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'List of Offered Courses.xlsx')
+
+
+def make_generator(courses):
+    generator = TimetableGenerator()
+    for room in create_rooms():
+        generator.add_room(room)
+    for slot in create_time_slots():
+        generator.add_time_slot(slot)
+    for course in courses:
+        generator.add_course(course)
+    return generator
+
+
+def assert_no_clashes(generator):
+    """No teacher or student group may have two different courses in one time slot."""
+    seen = {}
+    for course in generator.courses:
+        slot = generator.color_assignments[course.id]
+        for key in (('teacher', course.teacher), ('group', course.student_group)):
+            other = seen.setdefault((key, slot), course.id)
+            assert other == course.id, f"{key} has {other} and {course.id} in slot {slot}"
+
+
+def assert_rooms_not_double_booked(generator):
+    """Two different course ids may not hold the same room in one time slot."""
+    holders = {}
+    for course_id, room_id in generator.room_assignments.items():
+        key = (room_id, generator.color_assignments[course_id])
+        assert holders.setdefault(key, course_id) == course_id, f"{key} held by {holders[key]} and {course_id}"
+
+
+def test_sections_sharing_an_id_keep_their_own_conflicts():
+    generator = make_generator([
+        Course('MT102-1', 'Calculus (Section A)', 'T1', 'G1', 60, 'FES'),
+        Course('MT102-1', 'Calculus (Section B)', 'T2', 'G2', 60, 'FES'),
+        Course('PH101-1', 'Physics', 'T1', 'G3', 60, 'FES'),
+        Course('CH101-1', 'Chemistry', 'T3', 'G3', 60, 'FES'),
+    ])
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_timetable()
+
+    assert_no_clashes(generator)
+    t1_slots = [(time_slot.day, time_slot.start_time) for _, time_slot, _ in generator.teacher_schedules['T1']]
+    assert len(t1_slots) == len(set(t1_slots))
+
+
+def test_bundled_workbook_has_no_clashes(tmp_path):
+    # The loader caches a Parquet copy next to the workbook, so read it from tmp_path
+    workbook = shutil.copy(WORKBOOK, tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        courses = load_courses_from_excel(workbook)
+    assert courses
+    generator = make_generator(courses)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        generator.generate_timetable()
+
+    assert_no_clashes(generator)
+    assert_rooms_not_double_booked(generator)
+    assert "Could not assign room" not in output.getvalue()
+    assert set(generator.room_assignments) == {course.id for course in courses}
+
+
+def test_pipeline_steps_pack_courses_added_after_a_run():
+    generator = make_generator([
+        Course('CS101-1', 'Programming', 'T1', 'G1', 60, 'FCSE'),
+        Course('CS102-1', 'Data Structures', 'T1', 'G1', 60, 'FCSE'),
+    ])
+    generator.build_conflict_graph()
+    generator.color_assignments = generator.dsatur_coloring()
+    generator.assign_rooms()
+    assert_no_clashes(generator)
+
+    generator.add_course(Course('CS103-1', 'Algorithms', 'T1', 'G2', 60, 'FCSE'))
+    generator.build_conflict_graph()
+    generator.color_assignments = generator.dsatur_coloring()
+    assert_no_clashes(generator)
+
+
+def test_room_search_backtracks_where_first_fit_fails():
+    generator = make_generator([
+        Course('A-1', 'A', 'T1', 'G1', 60, 'FCSE'),
+        Course('B-1', 'B', 'T2', 'G2', 60, 'FCSE'),
+        Course('C-1', 'C', 'T3', 'G3', 60, 'FCSE'),
+    ])
+    generator._freeze()
+    # Course 0 may use rooms 1 or 3; courses 1 and 2 both need one of rooms 1 and 2
+    candidates = {0: [1, 3], 1: [1, 2], 2: [1, 2]}
+
+    first_fit = generator._first_fit_rooms([0, 1, 2], candidates, {1, 2, 3})
+    assert 2 not in first_fit
+
+    placed = generator._place_courses([0, 1, 2], candidates, [0, 0, 0], max_backtracks=10)
+    assert placed == {0: 3, 1: 1, 2: 2}
+
+
+def test_room_search_never_seats_fewer_courses_than_first_fit():
+    generator = make_generator([])
+    generator._freeze()
+    # More courses than free rooms, and uneven candidate lists; first-fit is already best
+    for candidates, expected in (({0: [2], 1: [2], 2: [1]}, {0: 2, 2: 1}),
+                                 ({0: [1], 1: [1], 2: [2]}, {0: 1, 2: 2})):
+        assert generator._place_courses([0, 1, 2], candidates, [0, 0, 0], max_backtracks=10) == expected
+
+
+def test_room_search_skips_a_course_to_seat_more_when_rooms_run_short():
+    generator = make_generator([])
+    generator._freeze()
+    # Six courses share three rooms and courses 1, 2 and 4 all need room 3;
+    # first-fit gives room 3 to course 0 and seats only two courses
+    candidates = {0: [3, 1], 1: [3], 2: [3], 3: [1, 3, 2], 4: [3], 5: [1]}
+    courses = list(candidates)
+
+    first_fit = generator._first_fit_rooms(courses, candidates, {1, 2, 3})
+    assert len(first_fit) == 2
+
+    placed = generator._place_courses(courses, candidates, [0] * len(courses), max_backtracks=10)
+    assert len(placed) == 3
+    assert len(set(placed.values())) == 3
+    assert all(room in candidates[course] for course, room in placed.items())
+
+
+def test_missing_workbook_cells_load_as_nan(tmp_path):
+    workbook = tmp_path / 'courses.xlsx'
+    pd.DataFrame({
+        'Code': ['CS101', None, 'CS201'], 'Course Title': ['Programming', 'Seminar', None],
+        'CH': [None, '1', '1'], 'Course Instructor': [None, 'T1', 'T2'],
+        'Offered For': ['BCS2', 'BCS2', 'BCS4'], 'Offered By': ['FCSE', 'FCSE', 'FCSE'],
+    }).to_excel(workbook, index=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        courses = load_courses_from_excel(str(workbook))
+
+    assert [(course.id, course.name, course.course_code, course.teacher, course.student_group)
+            for course in courses] == [
+        ('CS101-1', 'Programming (Session 1)', 'CS101', 'nan', 'BCS2'),
+        ('nan-1', 'Seminar (Session 1)', 'nan', 'T1', 'BCS2'),
+        ('CS201-1', 'nan (Session 1)', 'CS201', 'T2', 'BCS4'),
+    ]
+
+
+def test_cached_workbook_reads_are_independent_copies(tmp_path):
+    workbook = tmp_path / 'courses.xlsx'
+    pd.DataFrame({
+        'Code': ['CS101'], 'Course Title': ['Programming'], 'CH': ['3'],
+        'Course Instructor': ['T1'], 'Offered For': ['BCS2'], 'Offered By': ['FCSE'],
+    }).to_excel(workbook, index=False)
+    mtime = os.path.getmtime(workbook)
+
+    first = read_offered_courses(str(workbook), mtime)
+    first.loc[0, 'Code'] = 'EDITED'
+    assert read_offered_courses(str(workbook), mtime).loc[0, 'Code'] == 'CS101'
@@ -1,16 +1,30 @@
-from typing import List, Dict, Set, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from collections import defaultdict
-import networkx as nx
+import heapq
+import numpy as np
 from datetime import datetime, timedelta
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@dataclass(slots=True)
 class TimeSlot:
     day: str
     start_time: datetime
     end_time: datetime
+    # 'HH:MM' renderings of start_time/end_time, cached for display
+    start_str: str = field(default="", init=False, repr=False, compare=False)
+    end_str: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.start_str = self.start_time.strftime('%H:%M')
+        self.end_str = self.end_time.strftime('%H:%M')
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     id: str
     name: str
@@ -18,8 +32,9 @@ class Course:
     student_group: str
     duration: int  # in minutes
     department: str  # Added department field
+    course_code: str = ""  # e.g. 'CS101' for every session of that course
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     id: str
     capacity: int
@@ -31,16 +46,45 @@ class TimetableGenerator:
         self.courses: List[Course] = []
         self.time_slots: List[TimeSlot] = []
         self.rooms: List[Room] = []
-        self.graph = nx.Graph()
+        self._room_by_id: Dict[str, Room] = {}
+        # Teachers and student groups interned to int ids as courses are added
+        self._teacher_ids: Dict[str, int] = {}
+        self._group_ids: Dict[str, int] = {}
+        self._course_teacher_ids: List[int] = []
+        self._course_group_ids: List[int] = []
+        # Sections that share a course id are scheduled together as one vertex
+        self._vertex_ids: Dict[str, int] = {}
+        self._course_vertex_ids: List[int] = []
+        # Parallel per-course / per-room arrays packed by _freeze for the scheduler core
+        self._course_teacher = np.empty(0, dtype=np.int64)
+        self._course_group = np.empty(0, dtype=np.int64)
+        self._course_vertex = np.empty(0, dtype=np.int64)
+        self._course_dept = np.empty(0, dtype=np.int64)
+        self._room_dept = np.empty(0, dtype=np.int64)
+        self._nab_dept = -1
+        # Conflict graph over course ids (vertex indices) in CSR form
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int64)
+        self._degree = np.empty(0, dtype=np.int64)
         self.color_assignments: Dict[str, int] = {}  # course_id -> time_slot_index
         self.room_assignments: Dict[str, str] = {}  # course_id -> room_id
+        self._occupied = np.zeros((0, 0), dtype=bool)  # [room_index, time_slot_index]
         self.teacher_schedules: Dict[str, List[Tuple[Course, TimeSlot, Room]]] = defaultdict(list)
         self.student_schedules: Dict[str, List[Tuple[Course, TimeSlot, Room]]] = defaultdict(list)
 
     def add_course(self, course: Course):
         """Add a course to the system."""
+        # Departments are compared case-insensitively, so normalize them once here
+        course.department = course.department.upper()
+        if not course.course_code:
+            course.course_code = course.id.split('-')[0]
         self.courses.append(course)
-        self.graph.add_node(course.id)
+        self._course_teacher_ids.append(
+            self._teacher_ids.setdefault(course.teacher, len(self._teacher_ids)))
+        self._course_group_ids.append(
+            self._group_ids.setdefault(course.student_group, len(self._group_ids)))
+        self._course_vertex_ids.append(
+            self._vertex_ids.setdefault(course.id, len(self._vertex_ids)))
 
     def add_time_slot(self, time_slot: TimeSlot):
         """Add a time slot to the system."""
@@ -48,102 +92,196 @@ class TimetableGenerator:
 
     def add_room(self, room: Room):
         """Add a room to the system."""
+        room.department = room.department.upper()
         self.rooms.append(room)
+        self._room_by_id[room.id] = room
+
+    def _freeze(self):
+        """
+        Pack the course and room fields used by the scheduler into parallel arrays
+        (one entry per course or room index).
+        """
+        self._course_teacher = np.array(self._course_teacher_ids, dtype=np.int64)
+        self._course_group = np.array(self._course_group_ids, dtype=np.int64)
+        self._course_vertex = np.array(self._course_vertex_ids, dtype=np.int64)
+        dept_codes: Dict[str, int] = {}
+        self._course_dept = _factorize([course.department for course in self.courses], dept_codes)
+        self._room_dept = _factorize([room.department for room in self.rooms], dept_codes)
+        self._nab_dept = dept_codes.get('NAB', -1)
+        self._occupied = np.zeros((len(self.rooms), len(self.time_slots)), dtype=bool)
+
+    def _ensure_frozen(self):
+        """Pack the arrays again if courses, rooms or time slots were added since _freeze."""
+        if (len(self._course_teacher) != len(self.courses)
+                or self._occupied.shape != (len(self.rooms), len(self.time_slots))):
+            self._freeze()
 
     def build_conflict_graph(self):
-        """Build the conflict graph where edges represent course conflicts."""
-        for i, course1 in enumerate(self.courses):
-            for course2 in self.courses[i+1:]:
-                if (course1.teacher == course2.teacher or 
-                    course1.student_group == course2.student_group):
-                    self.graph.add_edge(course1.id, course2.id)
-
-    def welsh_powell_coloring(self) -> Dict[str, int]:
         """
-        Implement Welsh-Powell graph coloring algorithm.
+        Build the conflict graph where edges represent course conflicts.
+        Courses are bucketed by teacher and by student group, and edges are only
+        added within a bucket. Sections sharing a course id are one vertex, since
+        they share a time slot; the graph is stored as a CSR adjacency over those.
+        Time Complexity: O(C log C + sum(k^2)), where k is the size of each bucket
+        """
+        self._ensure_frozen()
+        u, v = _build_edges(self._course_teacher, self._course_group)
+        # Map section edges onto their course ids, dropping self-loops and repeats
+        n_vertices = len(self._vertex_ids)
+        u, v = self._course_vertex[u], self._course_vertex[v]
+        distinct = u != v
+        pairs = np.unique(np.minimum(u, v)[distinct] * n_vertices + np.maximum(u, v)[distinct])
+        self._indptr, self._indices, self._degree = _to_csr(
+            n_vertices, pairs // n_vertices, pairs % n_vertices)
+
+    def dsatur_coloring(self) -> Dict[str, int]:
+        """
+        Implement DSATUR graph coloring: repeatedly color the uncolored vertex
+        whose neighbours already use the most distinct colors, breaking ties by degree.
         Returns a dictionary mapping course IDs to time slot indices.
-        Time Complexity: O(V^2 + E), where V is number of vertices and E is number of edges
+        Time Complexity: O((V + E) log V + V * T), where V is number of vertices,
+        E is number of edges and T is number of time slots
         """
-        # Sort vertices by degree in descending order
-        vertices = sorted(self.graph.nodes(), 
-                        key=lambda x: self.graph.degree(x), 
-                        reverse=True)
-        
-        colors = {}  # vertex -> color
-        available_colors = set(range(len(self.time_slots)))
-        
-        for vertex in vertices:
-            # Find colors used by adjacent vertices
-            used_colors = {colors[neighbor] for neighbor in self.graph.neighbors(vertex)
-                         if neighbor in colors}
-            
-            # Assign the first available color
-            color = next(color for color in available_colors if color not in used_colors)
-            colors[vertex] = color
-            
-        return colors
-
-    def assign_rooms(self):
+        colors = _dsatur_coloring(self._indptr, self._indices, self._degree, len(self.time_slots))
+
+        course_ids = list(self._vertex_ids)
+        uncolored = np.flatnonzero(colors < 0)
+        if uncolored.size:
+            raise ValueError(f"Not enough time slots to schedule {course_ids[uncolored[0]]}")
+        return {course_id: int(color) for course_id, color in zip(course_ids, colors)}
+
+    def assign_rooms(self, max_backtracks: int = 1000):
         """
-        Assign rooms to courses using a three-tier approach:
-        1. Try department's own rooms first
-        2. Try NAB rooms if department rooms are full
-        3. Try other departments' rooms as a last resort
-        Time Complexity: O(C * R), where C is number of courses and R is number of rooms
+        Assign rooms to courses, searching a time slot with backtracking and forward
+        checking when first-fit leaves a course out. Candidate rooms are tried in three tiers:
+        1. Department's own rooms first
+        2. NAB rooms if department rooms are full
+        3. Other departments' rooms as a last resort
+        Every department fills its own rooms first; only the leftover courses then
+        compete for NAB and other departments' rooms in tiers 2 and 3.
+        Time Complexity: O(C * R) without backtracking, where C is number of courses and R is number of rooms
         """
-        for course in self.courses:
-            time_slot_idx = self.color_assignments[course.id]
-            time_slot = self.time_slots[time_slot_idx]
-            assigned = False
-
-            # Tier 1: Try department's own rooms
-            department_rooms = [r for r in self.rooms if r.department == course.department]
-            for room in department_rooms:
-                if self._is_room_available(room.id, time_slot):
-                    self.room_assignments[course.id] = room.id
-                    assigned = True
-                    break
-
-            # Tier 2: Try NAB rooms if department rooms are full
-            if not assigned:
-                nab_rooms = [r for r in self.rooms if r.department.upper() == 'NAB']
-                for room in nab_rooms:
-                    if self._is_room_available(room.id, time_slot):
-                        self.room_assignments[course.id] = room.id
-                        assigned = True
-                        break
-
-            # Tier 3: Try other departments' rooms as a last resort
-            if not assigned:
-                other_rooms = [r for r in self.rooms 
-                             if r.department != course.department 
-                             and r.department.upper() != 'NAB']
-                for room in other_rooms:
-                    if self._is_room_available(room.id, time_slot):
-                        self.room_assignments[course.id] = room.id
-                        assigned = True
-                        break
-
-            # If still not assigned, print debug info
-            if not assigned:
+        self._ensure_frozen()
+        not_nab = self._room_dept != self._nab_dept
+        nab_rooms = np.flatnonzero(~not_nab).tolist()
+        course_dept = self._course_dept.tolist()
+        course_slot = [self.color_assignments[course.id] for course in self.courses]
+        # Sections sharing a course id also share its room (room_assignments is keyed
+        # by id), so only the first section of each id is placed
+        first_sections = np.unique(self._course_vertex, return_index=True)[1].tolist()
+        courses_by_dept: Dict[int, List[int]] = defaultdict(list)
+        for idx in first_sections:
+            courses_by_dept[course_dept[idx]].append(idx)
+
+        # Tier 1: department's own rooms, which no other department competes for here
+        placed: Dict[int, int] = {}
+        for dept, dept_courses in courses_by_dept.items():
+            own_rooms = np.flatnonzero(not_nab & (self._room_dept == dept)).tolist()
+            candidates = {idx: own_rooms for idx in dept_courses}
+            placed.update(self._place_courses(dept_courses, candidates, course_slot, max_backtracks))
+        self._apply_room_choices(placed, course_slot)
+
+        # Tiers 2 and 3: NAB rooms, then other departments' rooms, shared by all leftovers
+        leftover = [idx for idx in first_sections if idx not in placed]
+        overflow_rooms: Dict[int, List[int]] = {}
+        for dept in {course_dept[idx] for idx in leftover}:
+            overflow_rooms[dept] = nab_rooms + np.flatnonzero(not_nab & (self._room_dept != dept)).tolist()
+        candidates = {idx: overflow_rooms[course_dept[idx]] for idx in leftover}
+        placed = self._place_courses(leftover, candidates, course_slot, max_backtracks)
+        self._apply_room_choices(placed, course_slot)
+
+        for idx in leftover:
+            if idx not in placed:
+                course = self.courses[idx]
+                time_slot = self.time_slots[course_slot[idx]]
+                # If still not assigned, print debug info
                 print(f"Warning: Could not assign room for {course.id} ({course.name})")
                 print(f"Department: {course.department}")
-                print(f"Time slot: {time_slot.day} {time_slot.start_time.strftime('%H:%M')}")
+                print(f"Time slot: {time_slot.day} {time_slot.start_str}")
+
+    def _place_courses(self, pending: List[int], candidates: Dict[int, List[int]],
+                       course_slot: List[int], max_backtracks: int) -> Dict[int, int]:
+        """
+        Choose candidate rooms for pending course indices, one time slot at a time.
+        A slot keeps its first-fit placement unless that leaves out a course that
+        could still have had a room; it is then searched for a placement that seats
+        more courses, for at most max_backtracks undone room choices.
+        Only reads the occupancy matrix; returns course index -> room index.
+        """
+        courses_by_slot: Dict[int, List[int]] = defaultdict(list)
+        for idx in pending:
+            courses_by_slot[course_slot[idx]].append(idx)
 
-    def _is_room_available(self, room_id: str, time_slot: TimeSlot) -> bool:
+        placed: Dict[int, int] = {}
+        for time_slot_idx, slot_courses in courses_by_slot.items():
+            free = {room for room in set().union(*(candidates[idx] for idx in slot_courses))
+                    if self._is_room_available(room, time_slot_idx)}
+            chosen = self._first_fit_rooms(slot_courses, candidates, set(free))
+            # No placement can seat more courses than have a free candidate room,
+            # nor more than there are free rooms
+            placeable = [idx for idx in slot_courses if not free.isdisjoint(candidates[idx])]
+            if len(chosen) < min(len(placeable), len(free)):
+                best = [chosen]
+                self._search_rooms(placeable, candidates, free, {}, best, [max_backtracks])
+                chosen = best[0]
+            placed.update(chosen)
+        return placed
+
+    def _apply_room_choices(self, placed: Dict[int, int], course_slot: List[int]):
+        """Record course index -> room index choices as assignments and occupancy."""
+        for idx, room_idx in placed.items():
+            self.room_assignments[self.courses[idx].id] = self.rooms[room_idx].id
+            self._occupied[room_idx, course_slot[idx]] = True
+
+    def _search_rooms(self, pending: List[int], candidates: Dict[int, List[int]],
+                      free: Set[int], chosen: Dict[int, int], best: List[Dict[int, int]],
+                      budget: List[int]) -> bool:
+        """
+        Extend chosen with free candidate room indices of a single time slot for as
+        many pending course indices as possible, placing the course with the fewest
+        free candidate rooms first (MRV) and skipping courses that cannot be placed.
+        Every placement seating more courses than best[0] replaces it. Returns False
+        once the backtracking budget (budget[0] undos) runs out; free and chosen are
+        left as they were either way.
+        """
+        # Forward check: courses left without a free candidate room are skipped
+        pending = [c for c in pending if not free.isdisjoint(candidates[c])]
+        # Bound: give up on branches that cannot seat more courses than best
+        if len(chosen) + min(len(pending), len(free)) <= len(best[0]):
+            return True
+        if not pending:
+            best[0] = dict(chosen)
+            return True
+        course = min(pending, key=lambda c: len(free.intersection(candidates[c])))
+        rest = [c for c in pending if c != course]
+        for room in candidates[course]:
+            if room not in free:
+                continue
+            free.remove(room)
+            chosen[course] = room
+            finished = self._search_rooms(rest, candidates, free, chosen, best, budget)
+            free.add(room)
+            del chosen[course]
+            budget[0] -= 1
+            if not finished or budget[0] <= 0:
+                return False
+        # Leaving this course out may free a room for two others
+        return self._search_rooms(rest, candidates, free, chosen, best, budget)
+
+    def _first_fit_rooms(self, pending: List[int], candidates: Dict[int, List[int]],
+                         free: Set[int]) -> Dict[int, int]:
+        """Give each course index its first free candidate room index, skipping courses with none left."""
+        chosen = {}
+        for course in pending:
+            room = next((r for r in candidates[course] if r in free), None)
+            if room is not None:
+                free.remove(room)
+                chosen[course] = room
+        return chosen
+
+    def _is_room_available(self, room_idx: int, time_slot_idx: int) -> bool:
         """Check if a room is available during a given time slot."""
-        for course_id, assigned_room in self.room_assignments.items():
-            if assigned_room == room_id:
-                course_time_slot = self.time_slots[self.color_assignments[course_id]]
-                if self._time_slots_overlap(time_slot, course_time_slot):
-                    return False
-        return True
-
-    def _time_slots_overlap(self, slot1: TimeSlot, slot2: TimeSlot) -> bool:
-        """Check if two time slots overlap."""
-        return (slot1.day == slot2.day and
-                slot1.start_time < slot2.end_time and
-                slot2.start_time < slot1.end_time)
+        return not self._occupied[room_idx, time_slot_idx]
 
     def optimize_schedules(self):
         """
@@ -157,7 +295,7 @@ class TimetableGenerator:
                 continue  # Skip courses with no room assigned
             time_slot_idx = self.color_assignments[course.id]
             time_slot = self.time_slots[time_slot_idx]
-            room = next(r for r in self.rooms if r.id == self.room_assignments[course.id])
+            room = self._room_by_id[self.room_assignments[course.id]]
             self.teacher_schedules[course.teacher].append((course, time_slot, room))
             self.student_schedules[course.student_group].append((course, time_slot, room))
 
@@ -170,39 +308,142 @@ class TimetableGenerator:
     def generate_timetable(self):
         """Generate the complete timetable."""
         self.build_conflict_graph()
-        self.color_assignments = self.welsh_powell_coloring()
+        self.color_assignments = self.dsatur_coloring()
         self.assign_rooms()
         self.optimize_schedules()
         return self._format_timetable()
 
     def _format_timetable(self) -> str:
         """Format the timetable for display."""
-        output = []
-        
+        return "\n".join(self._iter_lines())
+
+    def _iter_lines(self):
+        """Yield the lines of the formatted timetable one at a time."""
         # Course assignments
-        output.append("Course Assignments:")
+        yield "Course Assignments:"
         for course in self.courses:
             time_slot = self.time_slots[self.color_assignments[course.id]]
-            room = next(r for r in self.rooms if r.id == self.room_assignments[course.id])
-            output.append(f"{course.name}: {time_slot.day} {time_slot.start_time.strftime('%H:%M')}-"
-                        f"{time_slot.end_time.strftime('%H:%M')} in Room {room.id}")
+            room_id = self.room_assignments[course.id]
+            yield (f"{course.name}: {time_slot.day} {time_slot.start_str}-"
+                   f"{time_slot.end_str} in Room {room_id}")
         
         # Teacher schedules
-        output.append("\nTeacher Schedules:")
+        yield "\nTeacher Schedules:"
         for teacher, schedule in self.teacher_schedules.items():
-            output.append(f"\n{teacher}:")
+            yield f"\n{teacher}:"
             for course, time_slot, room in schedule:
-                output.append(f"  {time_slot.day} {time_slot.start_time.strftime('%H:%M')}-"
-                            f"{time_slot.end_time.strftime('%H:%M')}: {course.name} in Room {room.id}")
+                yield (f"  {time_slot.day} {time_slot.start_str}-"
+                       f"{time_slot.end_str}: {course.name} in Room {room.id}")
         
         # Student group schedules
-        output.append("\nStudent Group Schedules:")
+        yield "\nStudent Group Schedules:"
         for group, schedule in self.student_schedules.items():
-            output.append(f"\n{group}:")
+            yield f"\n{group}:"
             for course, time_slot, room in schedule:
-                output.append(f"  {time_slot.day} {time_slot.start_time.strftime('%H:%M')}-"
-                            f"{time_slot.end_time.strftime('%H:%M')}: {course.name} in Room {room.id}")
-        
-        return "\n".join(output) 
+                yield (f"  {time_slot.day} {time_slot.start_str}-"
+                       f"{time_slot.end_str}: {course.name} in Room {room.id}")
+
+
+def _factorize(values: List[str], codes: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """Map each distinct string to a dense int64 code, extending `codes` if given."""
+    if codes is None:
+        codes = {}
+    return np.fromiter((codes.setdefault(v, len(codes)) for v in values),
+                       dtype=np.int64, count=len(values))
+
+
+def _to_csr(n_vertices: int, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Convert an undirected edge list to CSR (indptr, indices) plus vertex degrees."""
+    src = np.concatenate([u, v])
+    dst = np.concatenate([v, u])
+    degree = np.bincount(src, minlength=n_vertices)
+    indptr = np.zeros(n_vertices + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    indices = dst[np.argsort(src, kind='stable')]
+    return indptr, indices, degree
+
+
+@njit('int64(int64[:], int64[:], int64[:], int64[:], int64[:], int64)', cache=True)
+def _bucket_pairs(key, order, skip_key, u, v, start):
+    """
+    Write every pair of courses sharing `key` into u/v from `start` on, or only
+    count them when u is empty. `order` sorts the courses by key; pairs that also
+    share `skip_key` are left out. Returns the next free edge index.
+    """
+    k = start
+    n = order.shape[0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        while hi < n and key[order[hi]] == key[order[lo]]:
+            hi += 1
+        for a in range(lo, hi):
+            for b in range(a + 1, hi):
+                i = order[a]
+                j = order[b]
+                if skip_key[i] == skip_key[j]:
+                    continue
+                if u.shape[0] > 0:
+                    u[k] = i
+                    v[k] = j
+                k += 1
+        lo = hi
+    return k
+
+
+@njit('UniTuple(int64[:], 2)(int64[:], int64[:])', cache=True)
+def _build_edges(teacher_id, group_id):
+    """Return the endpoint arrays of all conflict edges between course indices."""
+    n = teacher_id.shape[0]
+    by_teacher = np.argsort(teacher_id, kind='mergesort')
+    by_group = np.argsort(group_id, kind='mergesort')
+    no_skip = np.arange(n)
+    empty = np.empty(0, np.int64)
+
+    # First pass only counts edges so the output can be allocated once; courses
+    # sharing both teacher and group are emitted by the teacher pass only
+    n_edges = _bucket_pairs(teacher_id, by_teacher, no_skip, empty, empty, 0)
+    n_edges = _bucket_pairs(group_id, by_group, teacher_id, empty, empty, n_edges)
+
+    u = np.empty(n_edges, np.int64)
+    v = np.empty(n_edges, np.int64)
+    k = _bucket_pairs(teacher_id, by_teacher, no_skip, u, v, 0)
+    _bucket_pairs(group_id, by_group, teacher_id, u, v, k)
+    return u, v
+
+
+@njit('int64[:](int64[:], int64[:], int64[:], int64)', cache=True)
+def _dsatur_coloring(indptr, indices, degree, n_colors):
+    """
+    Color vertices in DSATUR order with the lowest color not used by a neighbour.
+    Vertices left without a color are marked -1.
+    """
+    n = degree.shape[0]
+    colors = np.full(n, -1, np.int64)
+    # neighbour_colors[v, c] is set once some neighbour of v has color c
+    neighbour_colors = np.zeros((n, n_colors), np.bool_)
+    saturation = np.zeros(n, np.int64)
 
- 
\ No newline at end of file
+    # Max-heap on (saturation, degree) with lazy deletion: an entry is stale
+    # once its vertex is colored or its saturation has grown since the push
+    heap = [(np.int64(0), -degree[v], np.int64(v)) for v in range(n)]
+    heapq.heapify(heap)
+    while len(heap) > 0:
+        neg_saturation, _, vertex = heapq.heappop(heap)
+        if colors[vertex] >= 0 or -neg_saturation != saturation[vertex]:
+            continue
+        color = -1
+        for c in range(n_colors):
+            if not neighbour_colors[vertex, c]:
+                color = c
+                break
+        if color < 0:
+            continue
+        colors[vertex] = color
+        for k in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[k]
+            if colors[neighbour] < 0 and not neighbour_colors[neighbour, color]:
+                neighbour_colors[neighbour, color] = True
+                saturation[neighbour] += 1
+                heapq.heappush(heap, (-saturation[neighbour], -degree[neighbour], neighbour))
+    return colors